@@ -2,6 +2,7 @@
 
 import sys
 import time
+from playwright.sync_api import TimeoutError as PWTimeout
 
 from src.config.settings import settings
 from src.config.constants import COURSE_CLASS, COURSE_TASK
@@ -29,6 +30,34 @@ def _slugify(title: str) -> str:
     return slug
 
 
+def _find_leetcode_tab(context):
+    return next(
+        (p for p in context.pages if "leetcode.com" in p.url and p.url != "about:blank"),
+        None,
+    )
+
+
+def _wait_for_leetcode_tab(context, known_pages=(), timeout: int = 10_000):
+    """
+    Return the LeetCode tab opened by the contest dialog, or None.
+    Reacts to the context's "page" event instead of polling every 500ms.
+    `known_pages` are the tabs open before the dialog: any other tab is the
+    new one, even while it still sits at about:blank.
+    """
+    page = _find_leetcode_tab(context)  # it may already be open
+    if page:
+        return page
+    try:
+        # The dialog's click may have opened the tab already, firing the event
+        new_page = next((p for p in context.pages if p not in known_pages), None)
+        if new_page is None:
+            new_page = context.wait_for_event("page", timeout=timeout)
+        new_page.wait_for_url("**leetcode.com/**", wait_until="commit", timeout=timeout)
+        return new_page
+    except PWTimeout:
+        return _find_leetcode_tab(context)
+
+
 def _day_key(day_num: int) -> str:
     return f"day_{day_num}"
 
@@ -141,23 +170,16 @@ def process_course(
 
             # Handle the LeetCode contest confirmation dialog
             bytesone_url_before = page.url
+            pages_before = list(browser._context.pages)
             if not bytesone.handle_contest_dialog():
                 logger.error(f"  {label_str} — could not confirm contest dialog")
                 progress.mark_failed(course_key, day_key, problem_id)
                 counts["failed"] += 1
                 continue
 
-            # Wait for LeetCode to open in NEW TAB (poll with retries)
+            # Wait for LeetCode to open in NEW TAB
             logger.info("Waiting for LeetCode tab to open...")
-            leetcode_page = None
-            for _attempt in range(20):  # poll up to 10 seconds (20 × 500ms)
-                page.wait_for_timeout(500)
-                for p in browser._context.pages:
-                    if "leetcode.com" in p.url and p.url != "about:blank":
-                        leetcode_page = p
-                        break
-                if leetcode_page:
-                    break
+            leetcode_page = _wait_for_leetcode_tab(browser._context, pages_before)
             
             if leetcode_page is None:
                 logger.error("Could not find LeetCode tab — contest may not have opened")
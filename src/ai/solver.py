@@ -11,12 +11,13 @@ Phase 3 — ESCALATION: Called after max debug cycles. AI rewrites from scratch
            with an explicit hint to try a completely different algorithm.
 """
 
-import re
 import time
 from dataclasses import dataclass
 from typing import Optional
 
 from src.utils.logger import setup_logger
+from src.utils.retry import backoff_delay
+from src.utils.text import strip_markdown
 
 logger = setup_logger(__name__)
 
@@ -123,7 +124,7 @@ class AIAgent:
         logger.info(f"[AI] Generating solution for '{title}' via {self.settings.llm_model}")
         code = self._call_with_retry(prompt)
         if code:
-            code = _strip_fences(code)
+            code = strip_markdown(code)
             logger.info(f"[AI] Generated {len(code)} chars ✅")
         return code
 
@@ -143,7 +144,7 @@ class AIAgent:
         )
         fixed = self._call_with_retry(prompt)
         if fixed:
-            fixed = _strip_fences(fixed)
+            fixed = strip_markdown(fixed)
             logger.info(f"[AI] Debug produced {len(fixed)} chars ✅")
         return fixed
 
@@ -158,7 +159,7 @@ class AIAgent:
         logger.warning(f"[AI] ESCALATING for '{title}' — requesting new algorithm")
         new_code = self._call_with_retry(prompt)
         if new_code:
-            new_code = _strip_fences(new_code)
+            new_code = strip_markdown(new_code)
             logger.info(f"[AI] Escalated solution: {len(new_code)} chars ✅")
         return new_code
 
@@ -186,11 +187,11 @@ class AIAgent:
             try:
                 return self._call_llm(prompt)
             except Exception as e:
-                wait = self._RETRY_BASE_DELAY * (2 ** (attempt - 1))
+                wait = backoff_delay(attempt, self._RETRY_BASE_DELAY)
                 if attempt < self._MAX_API_RETRIES:
                     logger.warning(
                         f"[AI] API error (attempt {attempt}/{self._MAX_API_RETRIES}): "
-                        f"{e} — retrying in {wait}s"
+                        f"{e} — retrying in {wait:.1f}s"
                     )
                     time.sleep(wait)
                 else:
@@ -238,13 +239,3 @@ class AIAgent:
             messages=[{"role": "user", "content": prompt}],
         )
         return message.content[0].text.strip()
-
-
-# ── helpers ────────────────────────────────────────────────────────────────────
-
-def _strip_fences(code: str) -> str:
-    """Remove markdown code fences the LLM may have added despite instructions."""
-    code = re.sub(r"^```[\w]*\n?", "", code, flags=re.MULTILINE)
-    code = re.sub(r"\n?```$", "", code, flags=re.MULTILINE)
-    return code.strip()
-
@@ -8,10 +8,14 @@ Handles two scenarios:
                   account picker (or type the email if picker not shown).
 """
 
+import re
 import time
+from typing import Pattern, Union
 from playwright.sync_api import Page, TimeoutError as PWTimeout
 
-from src.config.constants import GOOGLE_SELECTORS, TIMEOUT_SHORT, TIMEOUT_MEDIUM
+from src.config.constants import (
+    GOOGLE_SELECTORS, TIMEOUT_SHORT, TIMEOUT_MEDIUM, TIMEOUT_MANUAL_LOGIN,
+)
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -42,8 +46,25 @@ def _click_first_visible(page: Page, *selectors: str) -> bool:
 
 # ── public API ─────────────────────────────────────────────────────────────────
 
+def wait_until_logged_in(page: Page, url_re: Union[str, Pattern[str]],
+                         timeout: int = TIMEOUT_MANUAL_LOGIN) -> bool:
+    """
+    Block until the page URL matches `url_re` (e.g. the post-login redirect).
+
+    Returns True the moment the URL matches — the timeout is only an upper
+    bound — and False if it never does.
+    """
+    if isinstance(url_re, str):
+        url_re = re.compile(url_re)
+    try:
+        page.wait_for_url(url_re, timeout=timeout)
+        return True
+    except PWTimeout:
+        return False
+
+
 def wait_for_manual_login(page: Page, site_name: str, dashboard_indicator: str,
-                           timeout_ms: int = 300_000) -> bool:
+                           timeout_ms: int = TIMEOUT_MANUAL_LOGIN) -> bool:
     """
     Block until the user completes login manually.
 
@@ -3,9 +3,13 @@ Session manager — orchestrates first-run login and subsequent re-login checks.
 """
 
 import os
+import re
 from playwright.sync_api import Page
 
-from src.auth.google_oauth import wait_for_manual_login, handle_google_relogin
+from src.auth.google_oauth import (
+    wait_for_manual_login, wait_until_logged_in, handle_google_relogin,
+)
+from src.config.constants import LEETCODE_LOGIN_URL
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -24,6 +28,8 @@ LEETCODE_LOGGED_IN_SELECTORS = [
 ]
 # Selector that should NOT be visible when logged in
 LEETCODE_SIGNOUT_INDICATOR = "a[href*='/accounts/login'], button:has-text('Sign in'), a:has-text('Sign In')"
+# Any LeetCode page outside /accounts/ — where the login flow redirects once it completes
+LEETCODE_AFTER_LOGIN_URL = re.compile(r"^https://leetcode\.com/(?!accounts/)")
 
 
 def is_first_run(session_file: str) -> bool:
@@ -135,24 +141,24 @@ def _is_leetcode_logged_in(page: Page) -> bool:
 def _wait_for_leetcode_manual_login(page: Page, timeout_ms: int) -> bool:
     """
     Wait for the user to complete LeetCode login manually.
-    Polls every 2 seconds instead of relying on a single unreliable selector.
+    Opens the login page and returns as soon as LeetCode redirects away from
+    /accounts/ (instead of polling the logged-in selectors every 2 seconds).
     """
-    import time
     logger.info(
         f"\n{'='*60}\n"
         "  ACTION REQUIRED — Please log in to LeetCode in the browser window.\n"
         f"  Waiting up to {timeout_ms // 1000} seconds …\n"
         f"{'='*60}"
     )
-    elapsed = 0
-    poll_interval = 2_000  # ms
-    while elapsed < timeout_ms:
-        page.wait_for_timeout(poll_interval)
-        elapsed += poll_interval
-        if _is_leetcode_logged_in(page):
-            logger.info("Login to LeetCode detected ✅")
-            return True
-        logger.debug(f"Still waiting for LeetCode login … ({elapsed // 1000}s)")
+    page.goto(LEETCODE_LOGIN_URL)
+    if not wait_until_logged_in(page, LEETCODE_AFTER_LOGIN_URL, timeout=timeout_ms):
+        logger.error("Timed out waiting for LeetCode login")
+        return False
+
+    page.wait_for_load_state("load")
+    if _is_leetcode_logged_in(page):
+        logger.info("Login to LeetCode detected ✅")
+        return True
 
-    logger.error("Timed out waiting for LeetCode login")
+    logger.error("Left the LeetCode login page but no logged-in session was detected")
     return False
@@ -44,6 +44,8 @@ class BrowserManager:
                 "--no-default-browser-check",
             ],
             ignore_default_args=["--enable-automation"],
+            # Code is pasted into / copied out of editors via the clipboard
+            permissions=["clipboard-read", "clipboard-write"],
         )
 
         # persistent context stores session in user_data_dir automatically —
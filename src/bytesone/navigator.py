@@ -1,22 +1,29 @@
 """BytsOne navigator — courses → chapters → problems → Take Challenge → Mark Complete."""
 
+import logging
 import re
 import time
 from typing import List, Dict, Optional
 from playwright.sync_api import Page, TimeoutError as PWTimeout
 
 from src.config.constants import (
-    BYTESONE_CHALLENGE, COURSE_TITLE_FRAGMENTS,
+    BYTESONE_CHALLENGE, BYTESONE_CHAPTER, COURSE_TITLE_FRAGMENTS,
     BYTESONE_COURSES_URL, TIMEOUT_SHORT, TIMEOUT_MEDIUM, TIMEOUT_LONG,
 )
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+_DAY_PREFIX_RE = re.compile(r"^\s*Day\s+\d")
+_DAY_NUM_RE    = re.compile(r"^Day\s+(\d+)")
+_PERCENT_RE    = re.compile(r"(\d+)%")
+_SLUG_DROP_RE  = re.compile(r"[^a-z0-9\s-]")
+_WHITESPACE_RE = re.compile(r"\s+")
+
 
 def _slugify(text: str) -> str:
-    s = re.sub(r"[^a-z0-9\s-]", "", text.lower().strip())
-    return re.sub(r"\s+", "-", s).strip("-")
+    s = _SLUG_DROP_RE.sub("", text.lower().strip())
+    return _WHITESPACE_RE.sub("-", s).strip("-")
 
 
 class BytesOneNavigator:
@@ -47,20 +54,24 @@ class BytesOneNavigator:
             logger.warning("Course cards slow to render — waiting extra 3s")
             self.page.wait_for_timeout(3_000)
 
-        # Find all course cards and filter by text match
-        all_cards = self.page.locator("div").all()
+        # Find the course card by text match — one in-page pass over all divs
+        # instead of an inner_text() round-trip per div.
+        all_cards = self.page.locator("div")
         target_card = None
-        
-        for card in all_cards:
-            try:
-                text = card.inner_text(timeout=300).strip()
-                # Match cards that contain our fragment but aren't giant ancestor divs
-                if fragment in text and len(text) < len(fragment) + 100:
-                    target_card = card
-                    break
-            except Exception:
-                continue
-        
+        try:
+            idx = all_cards.evaluate_all(
+                """(els, frag) => els.findIndex(e => {
+                    const t = (e.innerText || '').trim();
+                    // Match cards that contain our fragment but aren't giant ancestor divs
+                    return t.includes(frag) && t.length < frag.length + 100;
+                })""",
+                fragment,
+            )
+            if idx >= 0:
+                target_card = all_cards.nth(idx)
+        except Exception as e:
+            logger.debug(f"Course card scan failed: {e}")
+
         if target_card is None:
             logger.error(f"Course card not found: {fragment}")
             return False
@@ -82,7 +93,6 @@ class BytesOneNavigator:
             target_card.click()
 
         self.page.wait_for_load_state("load")
-        self.page.wait_for_timeout(2_000)
         final_url = self.page.url
         logger.info(f"Opened course: {fragment} ✅  URL: {final_url}")
 
@@ -101,21 +111,31 @@ class BytesOneNavigator:
         Use a scoped selector instead of scanning every element on the page.
         """
         self.page.wait_for_load_state("load")
-        self.page.wait_for_timeout(2_000)  # give SPA time to render sidebar
 
         seen_days = set()
         chapters = []
 
-        # Scope to elements whose text starts with "Day " — much faster than locator("*")
-        candidates = self.page.locator("*:has-text('Day ')").all()
-        for el in candidates:
-            try:
-                text = el.inner_text(timeout=300).strip()
-            except Exception:
-                continue
+        # Scope to heading/row-like elements whose text starts with "Day <digit>" —
+        # `*:has-text(...)` matched every ancestor and walked the whole DOM.
+        rows = self.page.locator(BYTESONE_CHAPTER["chapter_candidates"]).filter(has_text=_DAY_PREFIX_RE)
+        try:
+            # The SPA renders the sidebar after the load event — wait for the first row
+            rows.first.wait_for(state="visible", timeout=TIMEOUT_MEDIUM)
+        except PWTimeout:
+            logger.warning("Chapter sidebar slow to render — scanning anyway")
+        # One batched read of every row's text + lock marker instead of
+        # inner_text()/inner_html() round-trips per row.
+        try:
+            row_data = rows.evaluate_all(
+                "(els) => els.map(e => [(e.innerText || '').trim(), (e.innerHTML || '').toLowerCase().includes('lock')])"
+            )
+        except Exception as e:
+            logger.warning(f"Could not read chapter rows: {e}")
+            row_data = []
 
+        for idx, (text, html_has_lock) in enumerate(row_data):
             # Must start with "Day <digit>"
-            m = re.match(r"^Day\s+(\d+)", text)
+            m = _DAY_NUM_RE.match(text)
             if not m:
                 continue
 
@@ -125,19 +145,14 @@ class BytesOneNavigator:
 
             # FILTER: must have "%" (progress indicator) or "lock" (lock icon)
             has_pct  = "%" in text
-            has_lock = False
-            try:
-                inner_html = el.inner_html(timeout=300)
-                has_lock = "lock" in inner_html.lower() or "🔒" in text
-            except Exception:
-                pass
+            has_lock = html_has_lock or "🔒" in text
 
             if not has_pct and not has_lock:
                 continue  # skip global nav items
 
             # Parse progress
             pct = 0
-            m_pct = re.search(r"(\d+)%", text)
+            m_pct = _PERCENT_RE.search(text)
             if m_pct:
                 pct = int(m_pct.group(1))
 
@@ -148,7 +163,7 @@ class BytesOneNavigator:
                 "locked":       has_lock and not has_pct,
                 "completed":    pct == 100,
                 "progress_pct": pct,
-                "element":      el,
+                "element":      rows.nth(idx),
             })
 
         chapters.sort(key=lambda c: c["day_num"])
@@ -163,7 +178,6 @@ class BytesOneNavigator:
         try:
             chapter["element"].click()
             self.page.wait_for_load_state("load")
-            self.page.wait_for_timeout(1_500)
             return True
         except Exception as e:
             logger.error(f"Could not click chapter {chapter['label']}: {e}")
@@ -177,7 +191,11 @@ class BytesOneNavigator:
         KEY: scope search to the container that has the 'N. Day N' heading.
         Problem items have circle indicators (no "%" text, no nav labels).
         """
-        self.page.wait_for_timeout(1_500)
+        # Wait (no longer than the old fixed 1.5s) for the content-area heading
+        try:
+            self.page.get_by_text(f"{day_num}. Day {day_num}").last.wait_for(timeout=1_500)
+        except PWTimeout:
+            pass
 
         # Find the day heading in the content area.
         # Try several patterns — actual format varies by platform version.
@@ -220,7 +238,10 @@ class BytesOneNavigator:
 
         # Walk UP from heading to find the panel containing the problem list.
         # Look for li OR div/a children — different platforms use different tags.
-        problems_data = self.page.evaluate(
+        # The result stays in the page as a JSHandle; Python only pulls the
+        # compact rows (and the walk log when it is actually logged).
+        heading_handle = heading_loc.element_handle()
+        problems_handle = self.page.evaluate_handle(
             """
             (headingEl) => {
                 if (!headingEl) return { debug: 'no element', items: [] };
@@ -240,6 +261,7 @@ class BytesOneNavigator:
 
                 const results = [];
                 const seen = new Set();
+                const seenIds = new Set();
                 const _NAV = new Set([
                     'dashboard','overall report','assessments','contest calendar',
                     'mentoring support','global platform assessments','courses',
@@ -270,18 +292,34 @@ class BytesOneNavigator:
                                      html.includes('done') ||
                                      el.querySelector('svg circle[fill]') !== null;
 
-                    results.push({ title: text, completed: hasCheck });
+                    // Tag the row so later lookups use an indexed attribute selector
+                    // instead of a text= scan; mirrors _slugify() on the Python side.
+                    let id = text.toLowerCase().trim()
+                        .replace(/[^a-z0-9\\s-]/g, '')
+                        .replace(/\\s+/g, '-')
+                        .replace(/^-+|-+$/g, '') || 'problem';
+                    if (seenIds.has(id)) id = `${id}-${results.length}`;
+                    seenIds.add(id);
+                    el.setAttribute('data-bytsone-problem-id', id);
+
+                    results.push({ title: text, id: id, completed: hasCheck });
                 });
 
                 return { debug: 'container: ' + container.tagName + '.' + container.className + ' walk: ' + walkLog.join(' | '), items: results };
             }
             """,
-            heading_loc.element_handle(),
+            heading_handle,
         )
-
-        # problems_data is now { debug: str, items: [...] }
-        debug_info = problems_data.get("debug", "") if isinstance(problems_data, dict) else ""
-        items = problems_data.get("items", []) if isinstance(problems_data, dict) else []
+        try:
+            items = problems_handle.evaluate(
+                "(o) => o.items.map(p => [p.title, p.id, p.completed])"
+            )
+            debug_info = ""
+            if not items or logger.isEnabledFor(logging.DEBUG):
+                debug_info = problems_handle.evaluate("(o) => o.debug")
+        finally:
+            problems_handle.dispose()
+            heading_handle.dispose()
 
         if not items:
             logger.warning(
@@ -292,15 +330,16 @@ class BytesOneNavigator:
         logger.debug(f"Day {day_num} JS container debug: {debug_info}")
 
         problems = []
-        for p in items:
-            title = p["title"].strip()
+        for raw_title, row_id, completed in items:
+            title = raw_title.strip()
             if not title:
                 continue
             problems.append({
                 "title":      title,
                 "problem_id": _slugify(title),
-                "completed":  p["completed"],
-                "element":    self.page.locator(f"li:has-text('{title}'), div:has-text('{title}')").last,
+                "completed":  completed,
+                # Resolved lazily in click_problem()
+                "selector":   f"[data-bytsone-problem-id='{row_id}']",
             })
 
         logger.info(
@@ -320,32 +359,41 @@ class BytesOneNavigator:
         }
         results = []
         seen = set()
-        for li in self.page.locator("li").all():
-            try:
-                t = li.inner_text().strip()
-                if not t or t.lower() in _NAV or re.match(r"^Day\s+\d", t) or "%" in t:
-                    continue
-                if t in seen:
-                    continue
-                seen.add(t)
-                results.append({
-                    "title":      t,
-                    "problem_id": _slugify(t),
-                    "completed":  False,
-                    "element":    li,
-                })
-            except Exception:
+        items = self.page.locator("li")
+        try:
+            texts = items.evaluate_all("(els) => els.map(e => (e.innerText || '').trim())")
+        except Exception as e:
+            logger.warning(f"Could not read list items: {e}")
+            return results
+        for idx, t in enumerate(texts):
+            if not t or t.lower() in _NAV or _DAY_NUM_RE.match(t) or "%" in t:
                 continue
+            if t in seen:
+                continue
+            seen.add(t)
+            results.append({
+                "title":      t,
+                "problem_id": _slugify(t),
+                "completed":  False,
+                "element":    items.nth(idx),
+            })
         return results
 
     def click_problem(self, problem: Dict) -> bool:
         """Click a problem row. Saves the current URL before navigating."""
         self._current_problem_url = self.page.url
         try:
-            problem["element"].click()
+            if "selector" in problem:
+                tagged = self.page.locator(problem["selector"])
+                if tagged.count():
+                    tagged.first.click()
+                else:
+                    # Tags live only in the DOM that was scanned — a reload of the
+                    # course page drops them, so re-resolve the row by its title
+                    self.page.locator("li, div").filter(has_text=problem["title"]).last.click()
+            else:
+                problem["element"].click()
             self.page.wait_for_load_state("load")
-            # Give the React SPA extra time to render the problem detail panel
-            self.page.wait_for_timeout(2_500)
             logger.info(f"Opened problem: {problem['title']}  URL: {self.page.url}")
             return True
         except Exception as e:
@@ -371,7 +419,13 @@ class BytesOneNavigator:
                 btn.wait_for(state="visible", timeout=TIMEOUT_SHORT)
                 btn.click()
                 logger.info("Clicked 'Activate' ✅")
-                self.page.wait_for_timeout(2_000)  # Wait for activation to complete
+                # Activation is done once the challenge button shows up
+                try:
+                    self.page.locator(BYTESONE_CHALLENGE["take_challenge"]).first.wait_for(
+                        state="visible", timeout=TIMEOUT_MEDIUM
+                    )
+                except PWTimeout:
+                    logger.debug("Challenge button not visible yet after activation")
                 return True
             except PWTimeout:
                 continue
@@ -386,7 +440,6 @@ class BytesOneNavigator:
         # Scroll down to ensure the button is in view (some pages hide it below fold)
         try:
             self.page.evaluate("window.scrollBy(0, 300)")
-            self.page.wait_for_timeout(500)
         except Exception:
             pass
 
@@ -406,7 +459,6 @@ class BytesOneNavigator:
                 btn.wait_for(state="visible", timeout=TIMEOUT_MEDIUM)
                 btn.click()
                 logger.info(f"Clicked 'Take Challenge' (selector: {sel})")
-                self.page.wait_for_timeout(1_500)
                 return True
             except PWTimeout:
                 continue
@@ -427,79 +479,61 @@ class BytesOneNavigator:
           Step 1: 'Continue' button (confirm username)  
           Step 2: checkbox + 'Start Contest'
         """
-        # Wait for dialog to appear
-        self.page.wait_for_timeout(2_000)
-        
-        # Step 1 — Continue (username confirmation)
+        # Step 1 — Continue (username confirmation); the visibility wait also
+        # covers the dialog's open animation.
         try:
             btn = self.page.locator(BYTESONE_CHALLENGE["dialog_continue_btn"]).first
             btn.wait_for(state="visible", timeout=TIMEOUT_MEDIUM)
             btn.click()
             logger.debug("Dialog step 1: Continue clicked")
-            self.page.wait_for_timeout(1_500)
         except PWTimeout:
             logger.debug("No Continue button — skipping to step 2")
 
-        # Step 2 — checkbox + Start Contest
-        # Try multiple strategies for the checkbox
-        checkbox_checked = False
-        
-        # Strategy 1: Find checkbox by type
-        checkbox_selectors = [
-            "input[type='checkbox']",
-            "input[type='checkbox'][id]",
-            "[role='checkbox']",
-            "div[role='checkbox']",
-            "span:has(input[type='checkbox'])",
-        ]
-        
-        for sel in checkbox_selectors:
-            try:
-                cb = self.page.locator(sel).first
-                cb.wait_for(state="visible", timeout=TIMEOUT_SHORT)
-                
-                # Check if it's already checked
-                is_checked = False
-                try:
-                    is_checked = cb.is_checked()
-                except:
-                    # If is_checked() fails, try clicking anyway
-                    pass
-                
-                if not is_checked:
-                    cb.click()
-                    logger.debug(f"Checkbox clicked: {sel}")
-                else:
-                    logger.debug(f"Checkbox already checked: {sel}")
-                
-                checkbox_checked = True
-                self.page.wait_for_timeout(800)
-                break
-            except PWTimeout:
-                continue
-        
-        if not checkbox_checked:
-            logger.warning("Could not find/check the checkbox — trying Start button anyway")
-
-        # Click Start Contest button
-        start_selectors = [
-            "button:has-text('Start Contest')",
-            "button:has-text('Start')",
-            "a:has-text('Start Contest')",
-            "[type='submit']:has-text('Start')",
-        ]
-        
-        for sel in start_selectors:
-            try:
-                start = self.page.locator(sel).first
-                start.wait_for(state="visible", timeout=TIMEOUT_MEDIUM)
-                start.click()
-                logger.info("Contest dialog confirmed ✅")
-                self.page.wait_for_timeout(1_500)
-                return True
-            except PWTimeout:
-                continue
-        
+        # Step 2 — checkbox + Start Contest in a single JS call.
+        # Only the checkbox gets a Playwright pre-wait so the dialog has rendered.
+        try:
+            self.page.locator(BYTESONE_CHALLENGE["dialog_checkbox"]).first.wait_for(
+                state="visible", timeout=TIMEOUT_SHORT
+            )
+        except PWTimeout:
+            logger.warning("Could not find the checkbox — trying Start button anyway")
+
+        started = self.page.evaluate(
+            """
+            async (checkboxSel) => {
+                const cb = document.querySelector(checkboxSel);
+                if (cb) {
+                    const checked = cb.matches('input')
+                        ? cb.checked
+                        : cb.getAttribute('aria-checked') === 'true';
+                    if (!checked) cb.click();
+                }
+
+                // Prefer the exact "Start Contest" label, then any "Start…" button
+                const findStart = () => {
+                    const btns = Array.from(document.querySelectorAll('button, a, [type="submit"]'));
+                    return btns.find(b => b.textContent.trim() === 'Start Contest')
+                        || btns.find(b => b.textContent.trim().startsWith('Start'));
+                };
+
+                // React re-enables the Start button once the checkbox state lands
+                for (let i = 0; i < 30; i++) {
+                    const btn = findStart();
+                    if (btn && !btn.disabled && btn.getAttribute('aria-disabled') !== 'true') {
+                        btn.click();
+                        return true;
+                    }
+                    await new Promise(r => setTimeout(r, 100));
+                }
+                return false;
+            }
+            """,
+            BYTESONE_CHALLENGE["dialog_checkbox"],
+        )
+        if started:
+            logger.info("Contest dialog confirmed ✅")
+            return True
+
         logger.error("'Start Contest' button not found")
         return False
 
@@ -514,7 +548,6 @@ class BytesOneNavigator:
         logger.debug(f"Returning to BytsOne: {url}")
         self.page.goto(url)
         self.page.wait_for_load_state("load")
-        self.page.wait_for_timeout(1_000)
         return True
 
     # ── 6. Completion ──────────────────────────────────────────────────────────
@@ -527,7 +560,6 @@ class BytesOneNavigator:
             btn.wait_for(state="visible", timeout=TIMEOUT_MEDIUM)
             btn.click()
             logger.info("Clicked 'Mark as Complete'")
-            self.page.wait_for_timeout(1_500)
         except PWTimeout:
             logger.warning("'Mark as Complete' not found")
             return False
@@ -545,7 +577,6 @@ class BytesOneNavigator:
                 confirm_btn.wait_for(state="visible", timeout=TIMEOUT_SHORT)
                 confirm_btn.click()
                 logger.info("Marked as Complete ✅")
-                self.page.wait_for_timeout(1_000)
                 return True
             except PWTimeout:
                 continue
@@ -11,15 +11,19 @@ BYTESONE_COURSES = {
     "continue_learning_btn": "button:has-text('Continue Learning'), a:has-text('Continue Learning')",
 }
 
+# ── Shared: "Sign in with Google" buttons (identical on BytsOne and LeetCode) ──
+
+GOOGLE_SIGNIN_BTNS = (
+    "button:has-text('Sign in with Google')",
+    "a:has-text('Sign in with Google')",
+    "button:has-text('Continue with Google')",
+    "a:has-text('Continue with Google')",
+)
+
 # ── BytsOne: Selectors for auth flow ────────────────────────────────────────────
 
 BYTESONE_SELECTORS = {
-    "google_signin_btn": [
-        "button:has-text('Sign in with Google')",
-        "a:has-text('Sign in with Google')",
-        "button:has-text('Continue with Google')",
-        "a:has-text('Continue with Google')",
-    ]
+    "google_signin_btn": GOOGLE_SIGNIN_BTNS,
 }
 
 # ── BytsOne: Course curriculum (chapter list) ───────────────────────────────────
@@ -27,6 +31,11 @@ BYTESONE_SELECTORS = {
 BYTESONE_CHAPTER = {
     # Chapter rows in the left sidebar (e.g. "Day 1", "Day 2")
     "chapter_row":   ".chapters-list li, [class*='chapter'], [class*='Chapter']",
+    # Small candidate set scanned for "Day N" rows — avoids a `*` walk of the whole DOM
+    "chapter_candidates": (
+        "li, a, button, h1, h2, h3, h4, h5, "
+        "[class*='chapter'], [class*='Chapter'], [class*='heading'], [class*='title']"
+    ),
     # Day label inside a row
     "day_label":     "text=Day",
     # Lock icon — indicates the day is locked
@@ -58,7 +67,7 @@ BYTESONE_CHALLENGE = {
     # Confirmation dialog elements
     "dialog_container":   "[role='dialog'], .modal, [class*='modal'], [class*='dialog']",
     "dialog_continue_btn": "button:has-text('Continue')",          # first modal step
-    "dialog_checkbox":     "input[type='checkbox']",               # confirmation checkbox
+    "dialog_checkbox":     "input[type='checkbox'], [role='checkbox']",  # confirmation checkbox
     "dialog_start_btn":    "button:has-text('Start Contest')",     # final confirm
     # Bottom bar buttons (shown when problem detail is open in a course)
     "mark_complete_btn":  "button:has-text('Mark as Complete'), a:has-text('Mark as Complete')",
@@ -83,12 +92,7 @@ LEETCODE_PROBLEM = {
 # ── LeetCode: Selectors for auth flow ──────────────────────────────────────────
 
 LEETCODE_SELECTORS = {
-    "google_signin_btn": [
-        "button:has-text('Sign in with Google')",
-        "a:has-text('Sign in with Google')",
-        "button:has-text('Continue with Google')",
-        "a:has-text('Continue with Google')",
-    ]
+    "google_signin_btn": GOOGLE_SIGNIN_BTNS,
 }
 
 # ── LeetCode: Solutions tab ─────────────────────────────────────────────────────
@@ -114,6 +118,7 @@ LEETCODE_SOLUTIONS = {
 
 LEETCODE_EDITOR = {
     "code_editor":              ".monaco-editor",
+    "editor_input":             ".monaco-editor textarea",  # the focusable input; the container div is not
     "lang_selector":            "[id*='lang'] button, button[class*='lang']",
     "java_option":              "text=Java",
     "submit_button":            ["[data-e2e-locator='console-submit-button']", "button:has-text('Submit')"],
@@ -122,6 +127,11 @@ LEETCODE_EDITOR = {
     # Fallback: CSS-class-based accepted signals (no broad text match)
     "result_accepted_fallback": ["[class*='accepted']", "[class*='success'][class*='result']"],
     "result_wrong":             ["text=Wrong Answer", "text=Runtime Error", "text=Time Limit Exceeded", "text=Compile Error"],
+    # Run-result (console) and submission-result panels, and the verdict labels they show
+    "console_result":           "[data-e2e-locator='console-result']",
+    "result_panel":             "[data-e2e-locator='submission-result']",
+    "result_failed":            ["Wrong Answer", "Runtime Error", "Time Limit Exceeded",
+                                 "Compile Error", "Memory Limit Exceeded", "Output Limit Exceeded"],
 }
 
 # ── Google OAuth ────────────────────────────────────────────────────────────────
@@ -140,6 +150,8 @@ GOOGLE_SELECTORS = {
 BYTESONE_BASE_URL    = "https://www.bytsone.com"
 BYTESONE_COURSES_URL = "https://www.bytsone.com/home/courses"
 LEETCODE_BASE_URL    = "https://leetcode.com"
+LEETCODE_LOGIN_URL   = "https://leetcode.com/accounts/login/"
+LEETCODE_GRAPHQL_URL = "https://leetcode.com/graphql/"
 GOOGLE_ACCOUNTS_URL  = "https://accounts.google.com"
 
 # ── Course identifiers ──────────────────────────────────────────────────────────
@@ -158,6 +170,9 @@ TIMEOUT_SHORT        = 5_000
 TIMEOUT_MEDIUM       = 15_000
 TIMEOUT_LONG         = 30_000
 TIMEOUT_EXTRA_LONG   = 60_000
+# Upper bound only: manual-login waits block on a URL/selector predicate
+# (see auth.google_oauth.wait_until_logged_in) and return as soon as it holds —
+# never sleep or poll for the full budget.
 TIMEOUT_MANUAL_LOGIN = 300_000
 
 # ── Retry ──────────────────────────────────────────────────────────────────────
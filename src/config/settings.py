@@ -1,7 +1,9 @@
 """Configuration settings loaded from environment variables."""
 
+from functools import cached_property, lru_cache
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from pydantic import Field, field_validator, model_validator
+from pydantic import Field, PrivateAttr, field_validator, model_validator
 from typing import Optional
 
 
@@ -13,6 +15,7 @@ class Settings(BaseSettings):
         env_file_encoding="utf-8",
         case_sensitive=False,
         extra="ignore",
+        frozen=True,
     )
 
     # BytsOne Configuration
@@ -26,7 +29,7 @@ class Settings(BaseSettings):
     bytesone_email: str = ""   # Karunya institutional email
     leetcode_email: str = ""   # Personal Gmail
 
-    @property
+    @cached_property
     def courses_list(self) -> list:
         return [c.strip() for c in self.courses_order.split(",") if c.strip()]
 
@@ -59,6 +62,8 @@ class Settings(BaseSettings):
     # Session Management
     session_file: str = "storage_state.json"
     progress_file: str = "progress.json"
+    solution_cache_file: str = "solution_cache.json"   # slug → scraped Java solution
+    solution_cache_ttl: int = Field(default=7 * 24 * 3600, gt=0)  # seconds
 
     # Automation Settings
     max_retries: int = Field(default=3, gt=0)
@@ -85,33 +90,46 @@ class Settings(BaseSettings):
         # Skip API key validation to avoid blocking users who haven't set one.
         return self
 
+    # Provider-resolved LLM fields — the model is frozen, so resolve them once
+    _llm_api_key: Optional[str] = PrivateAttr(default=None)
+    _llm_model: str = PrivateAttr(default="")
+    _llm_temperature: float = PrivateAttr(default=0.2)
+
+    def model_post_init(self, __context) -> None:
+        if self.llm_provider == "openrouter":
+            self._llm_api_key = self.openrouter_api_key
+            self._llm_model = self.openrouter_model
+            self._llm_temperature = self.openrouter_temperature
+        elif self.llm_provider == "openai":
+            self._llm_api_key = self.openai_api_key
+            self._llm_model = self.openai_model
+            self._llm_temperature = self.openai_temperature
+        else:
+            self._llm_api_key = self.anthropic_api_key
+            self._llm_model = self.anthropic_model
+            self._llm_temperature = self.anthropic_temperature
+
     @property
     def llm_api_key(self) -> Optional[str]:
-        if self.llm_provider == "openrouter":
-            return self.openrouter_api_key
-        if self.llm_provider == "openai":
-            return self.openai_api_key
-        return self.anthropic_api_key
+        return self._llm_api_key
 
     @property
     def llm_model(self) -> str:
-        if self.llm_provider == "openrouter":
-            return self.openrouter_model
-        if self.llm_provider == "openai":
-            return self.openai_model
-        return self.anthropic_model
+        return self._llm_model
 
     @property
     def llm_temperature(self) -> float:
-        if self.llm_provider == "openrouter":
-            return self.openrouter_temperature
-        if self.llm_provider == "openai":
-            return self.openai_temperature
-        return self.anthropic_temperature
+        return self._llm_temperature
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide Settings, parsing .env and validating only once."""
+    return Settings()
 
 
 try:
-    settings = Settings()
+    settings = get_settings()
 except Exception as _e:
     import sys
     print(f"\n[CONFIG ERROR] {_e}\nCopy .env.example → .env and fill in your values.\n")
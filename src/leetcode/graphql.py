@@ -0,0 +1,46 @@
+"""LeetCode GraphQL client — rides on the browser session's cookies via page.request."""
+
+from typing import Any, Dict, Optional
+from playwright.sync_api import Page
+
+from src.config.constants import LEETCODE_BASE_URL, LEETCODE_GRAPHQL_URL, TIMEOUT_MEDIUM
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+def post_graphql(page: Page, query: str, variables: Dict[str, Any],
+                 referer: str = LEETCODE_BASE_URL) -> Optional[Dict[str, Any]]:
+    """
+    POST a GraphQL query using the page's browser context, so the logged-in
+    session (cookies + CSRF token) carries over.
+
+    Returns the response's `data` object, or None on any HTTP/GraphQL error so
+    callers can fall back to DOM scraping.
+    """
+    csrf = next(
+        (c["value"] for c in page.context.cookies(LEETCODE_BASE_URL) if c["name"] == "csrftoken"),
+        "",
+    )
+    try:
+        resp = page.request.post(
+            LEETCODE_GRAPHQL_URL,
+            data={"query": query, "variables": variables},
+            headers={"Referer": referer, "x-csrftoken": csrf},
+            timeout=TIMEOUT_MEDIUM,
+        )
+    except Exception as e:
+        logger.debug(f"GraphQL request failed: {e}")
+        return None
+
+    if not resp.ok:
+        logger.debug(f"GraphQL request returned HTTP {resp.status}")
+        return None
+    try:
+        body = resp.json()
+    except Exception as e:
+        logger.debug(f"GraphQL response was not JSON: {e}")
+        return None
+    if body.get("errors"):
+        logger.debug(f"GraphQL errors: {body['errors']}")
+    return body.get("data")
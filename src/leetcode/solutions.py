@@ -1,25 +1,110 @@
 """LeetCode Solutions tab scraper — finds and copies the most upvoted Java solution."""
 
+import json
+import os
 import time
 import re
-from typing import Optional, List
-from playwright.sync_api import Page, TimeoutError as PWTimeout
+from html.parser import HTMLParser
+from typing import Optional, List, Dict, Tuple
+from urllib.parse import urljoin, urlparse
+from playwright.sync_api import Page, Locator, Route, TimeoutError as PWTimeout
 
 from src.config.constants import (
     LEETCODE_SOLUTIONS, LEETCODE_EDITOR,
     TIMEOUT_SHORT, TIMEOUT_MEDIUM, TIMEOUT_LONG,
 )
+from src.leetcode.graphql import post_graphql
 from src.utils.logger import setup_logger
+from src.utils.retry import backoff_delay
 
 logger = setup_logger(__name__)
 
 TARGET_LANGUAGE = "Java"
 
+# Resource types never needed for code extraction on the solutions pages
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+
+_PROBLEM_URL_RE = re.compile(r"(https://leetcode\.com/problems/([^/?#]+))")
+_SOLUTION_PATH_RE = re.compile(r"/solutions/[^/]+")
+_VOTE_SCALE = {"k": 1_000, "m": 1_000_000}
+# Code-block selectors on a solution detail page, in order of preference
+_CODE_SELECTORS = [
+    "pre code",
+    ".view-lines",
+    "[class*='CodeMirror'] .CodeMirror-code",
+    "[class*='hljs']",
+    "code[class*='language-java']",
+    "code[class*='language-']",
+    "code",
+    "pre",
+]
+# Probe for rendered solution code: Monaco models first, then _CODE_SELECTORS.
+_PROBE_CODE_JS = """(sels) => {
+    // Read-only Monaco editor (LeetCode embeds this in solution pages).
+    // Pick the largest model — solution pages may have the problem
+    // stub in model[0] and the actual solution elsewhere.
+    if (typeof monaco !== 'undefined') {
+        const models = monaco.editor.getModels() || [];
+        const vals = models.map(m => m.getValue()).filter(v => v);
+        if (vals.length > 0) {
+            const best = vals.reduce((a, b) => a.length > b.length ? a : b);
+            if (best.length > 150) return ['Monaco JS', best];
+        }
+    }
+    for (const s of sels) {
+        const e = document.querySelector(s);
+        if (e) {
+            const t = (e.innerText || '').trim();
+            if (t.length > 20) return ['DOM', t];
+        }
+    }
+    return null;
+}"""
+# Fenced code blocks in a community-solution post: (lang, body)
+_FENCE_BLOCK_RE = re.compile(r"```(\w*)[^\n]*\n(.*?)```", re.DOTALL)
+
+_COMMUNITY_SOLUTIONS_QUERY = """
+query communitySolutions($questionSlug: String!, $skip: Int!, $first: Int!,
+                         $orderBy: TopicSortingOption, $languageTags: [String!]) {
+  questionSolutions(filters: {questionSlug: $questionSlug, skip: $skip, first: $first,
+                              orderBy: $orderBy, languageTags: $languageTags}) {
+    solutions { id title post { voteCount content } }
+  }
+}
+"""
+
+# Exact-label filters for plain-CSS candidates (cheaper than :has-text)
+_SOLUTIONS_LABEL_RE = re.compile(r"^\s*Solutions\s*$")
+_COPY_LABEL_RE      = re.compile(r"^\s*Copy\s*$", re.IGNORECASE)
+
+_JAVA_KWS = re.compile(r"class |public |return |\{|\}")
+
 
 class LeetCodeSolutionScraper:
     def __init__(self, page: Page):
+        from src.config.settings import settings
+        self.settings = settings
+        self._loc_cache: Dict[str, Locator] = {}
+        self._solution_cache: Dict[str, Dict] = self._load_solution_cache()
         self.page = page
 
+    @property
+    def page(self) -> Page:
+        return self._page
+
+    @page.setter
+    def page(self, value: Page):
+        """Cached locators are bound to a page — drop them when the tab changes."""
+        self._page = value
+        self._loc_cache.clear()
+
+    def _loc(self, sel: str) -> Locator:
+        """Return the cached `.first` locator for a selector on the current page."""
+        loc = self._loc_cache.get(sel)
+        if loc is None:
+            loc = self._loc_cache[sel] = self.page.locator(sel).first
+        return loc
+
     # ── public API ─────────────────────────────────────────────────────────────
 
     def get_best_solution(self) -> Optional[str]:
@@ -27,85 +112,299 @@ class LeetCodeSolutionScraper:
         Navigate to Solutions page, apply Java filter, then iterate through
         solutions starting from the 2nd one until valid Java code is found.
         Returns None if no Java solution could be extracted.
+
+        Solutions are cached on disk by problem slug, so re-runs skip the
+        Solutions tab entirely while the cached entry is fresh. Entries are
+        written by store_solution() once the code has been Accepted.
         """
-        if not self._open_solutions_tab():
-            return None
+        m = _PROBLEM_URL_RE.match(self.page.url)
+        slug = m.group(2) if m else None
+        cached = self._cached_solution(slug) if slug else None
+        if cached:
+            logger.info(f"Using cached Java solution for {slug!r} ({len(cached)} chars) ✅")
+            return cached
+
+        # Happy path: top-voted Java posts straight from the GraphQL API — no
+        # Solutions-tab navigation, Monaco reads or DOM waits.
+        if slug:
+            code = next(
+                (c for c in self._fetch_java_solutions_via_graphql(slug) if _is_valid_java(c)),
+                None,
+            )
+            if code:
+                logger.info(f"Java solution fetched via GraphQL ({len(code)} chars) ✅")
+                return code
+            logger.info("GraphQL returned no usable Java solution — scraping the Solutions tab")
+
+        # Solutions pages pull avatars, icons and third-party assets we never read.
+        # Block them only while scraping so the problem editor page loads normally.
+        context = self.page.context
+        context.route("**/*", self._block_heavy_assets)
+        try:
+            # Lands on the already-filtered listing in one navigation
+            if not self._open_solutions_tab(TARGET_LANGUAGE):
+                return None
+
+            # Only the UI-tab fallback still needs the filter applied separately
+            self._apply_language_filter(TARGET_LANGUAGE)
 
-        # Apply Java filter via URL param
-        self._apply_language_filter(TARGET_LANGUAGE)
-        self.page.wait_for_timeout(1_500)
+            # Collect all solution detail page URLs, then iterate
+            code = self._find_java_solution()
+        finally:
+            context.unroute("**/*", self._block_heavy_assets)
 
-        # Collect all solution detail page URLs, then iterate
-        return self._find_java_solution()
+        return code
+
+    @staticmethod
+    def _block_heavy_assets(route: Route):
+        """Abort images/fonts/media, and stylesheets not served by LeetCode; keep all JS."""
+        req = route.request
+        host = urlparse(req.url).hostname or ""
+        if req.resource_type in _BLOCKED_RESOURCE_TYPES or (
+            req.resource_type == "stylesheet" and not host.endswith("leetcode.com")
+        ):
+            route.abort()
+        else:
+            route.continue_()
+
+    def _fetch_java_solutions_via_graphql(self, slug: str, first: int = 10) -> List[str]:
+        """Return Java code blocks from the most-voted community solutions, best first."""
+        data = post_graphql(
+            self.page,
+            _COMMUNITY_SOLUTIONS_QUERY,
+            {
+                "questionSlug": slug, "skip": 0, "first": first,
+                "orderBy": "most_votes", "languageTags": [TARGET_LANGUAGE.lower()],
+            },
+            referer=f"https://leetcode.com/problems/{slug}/solutions/",
+        )
+        solutions = ((data or {}).get("questionSolutions") or {}).get("solutions") or []
+        posts = sorted(
+            (s.get("post") or {} for s in solutions),
+            key=lambda p: p.get("voteCount") or 0,
+            reverse=True,
+        )
+        codes: List[str] = []
+        for post in posts:
+            content = post.get("content") or ""
+            if "\n" not in content:
+                content = content.replace("\\n", "\n")  # some posts come back escaped
+            for lang, body in _FENCE_BLOCK_RE.findall(content):
+                if lang.lower() in ("java", ""):
+                    codes.append(body.strip())
+                    break
+        return codes
+
+    # ── solution cache ─────────────────────────────────────────────────────────
+
+    def _load_solution_cache(self) -> Dict[str, Dict]:
+        path = self.settings.solution_cache_file
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            except (json.JSONDecodeError, IOError):
+                logger.warning(f"Could not read {path} — starting with an empty solution cache")
+        return {}
+
+    def _cached_solution(self, slug: str) -> Optional[str]:
+        entry = self._solution_cache.get(slug)
+        if entry and time.time() - entry.get("ts", 0) < self.settings.solution_cache_ttl:
+            return entry.get("code")
+        return None
+
+    def store_solution(self, slug: str, code: str):
+        """
+        Record a solution that passed submission and rewrite the cache file
+        atomically (tmp + rename). Unverified scrapes are never cached.
+        """
+        self._solution_cache[slug] = {"code": code, "ts": time.time()}
+        path = self.settings.solution_cache_file
+        tmp = f"{path}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._solution_cache, f)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"Could not write solution cache {path}: {e}")
 
     # ── private steps ──────────────────────────────────────────────────────────
 
     def _find_java_solution(self) -> Optional[str]:
         """
         Collect all solution URLs from the listing page and try each one
-        (starting from the 2nd) until valid Java code is found.
+        (most upvoted first when vote counts are readable, otherwise starting
+        from the 2nd) until valid Java code is found.
         """
-        links = self._get_solution_links()
+        # Only the first 10 attempts are ever tried (positions 2..11) — don't collect more
+        links = self._get_solution_links(limit=11)
 
         if not links:
             logger.warning("No solution links found on solutions page")
             return self._fallback_first_code_block()
 
-        logger.info(f"Found {len(links)} solution links — trying from 2nd onwards")
-
-        # Start from index 1 (2nd solution) to skip potentially locked/premium 1st,
-        # then fall back to the 1st if nothing else works.
-        order = list(range(1, len(links))) + [0] if len(links) > 1 else [0]
+        if any(votes for _, votes in links):
+            logger.info(f"Found {len(links)} solution links — trying most upvoted first")
+            # Stable sort: equal vote counts keep their listing order
+            order = sorted(range(len(links)), key=lambda i: -links[i][1])
+        else:
+            logger.info(f"Found {len(links)} solution links — trying from 2nd onwards")
+            # Start from index 1 (2nd solution) to skip potentially locked/premium 1st,
+            # then fall back to the 1st if nothing else works.
+            order = list(range(1, len(links))) + [0] if len(links) > 1 else [0]
+
+        candidates = [(idx, links[idx][0]) for idx in order[:10]]  # try up to 10
+
+        # While one candidate is being parsed, the next one loads in a second tab;
+        # the tabs swap roles on each attempt. The original tab is restored at the end.
+        home = self.page
+        spare = self._open_prefetch_page() if len(candidates) > 1 else None
+        extra = spare
+        prefetched: Optional[str] = None
+        try:
+            for attempt_num, (idx, url) in enumerate(candidates, 1):
+                logger.info(f"Solution attempt {attempt_num} (list position {idx + 1}): {url}")
+                if spare is not None and prefetched == url:
+                    self.page, spare = spare, self.page
+                else:
+                    try:
+                        self.page.goto(url)
+                    except Exception as e:
+                        logger.debug(f"Navigation failed for {url}: {e}")
+                        continue
 
-        for attempt_num, idx in enumerate(order[:10], 1):  # try up to 10
-            url = links[idx]
-            logger.info(f"Solution attempt {attempt_num} (list position {idx + 1}): {url}")
-            try:
-                self.page.goto(url)
-                self.page.wait_for_load_state("load")
-                self.page.wait_for_timeout(2_000)
-            except Exception as e:
-                logger.debug(f"Navigation failed for {url}: {e}")
-                continue
+                prefetched = None
+                if spare is not None and attempt_num < len(candidates):
+                    prefetched = self._prefetch(spare, candidates[attempt_num][1])
 
-            code = self._extract_code_from_solution_page()
-            if code and _is_valid_java(code):
-                logger.info(f"Valid Java solution found at position {idx + 1} ({len(code)} chars) ✅")
-                return code
+                try:
+                    # Proceed as soon as the solution's code block has rendered
+                    self._loc(".monaco-editor, pre code").wait_for(state="visible", timeout=TIMEOUT_MEDIUM)
+                except PWTimeout:
+                    logger.debug(f"No code block rendered for {url} — probing anyway")
+
+                code = self._extract_code_from_solution_page()
+                if code and _is_valid_java(code):
+                    logger.info(f"Valid Java solution found at position {idx + 1} ({len(code)} chars) ✅")
+                    return code
 
-            logger.debug(f"Position {idx + 1} has no valid Java code — trying next")
+                logger.debug(f"Position {idx + 1} has no valid Java code — trying next")
+        finally:
+            self.page = home
+            if extra is not None:
+                try:
+                    extra.close()  # also cancels any in-flight prefetch
+                except Exception:
+                    pass
 
         logger.warning("No valid Java solution found after trying all available solutions")
         return None
 
-    def _get_solution_links(self) -> List[str]:
-        """Collect all solution detail page URLs from the current solutions listing."""
-        links: List[str] = []
-        seen: set = set()
+    def _open_prefetch_page(self) -> Optional[Page]:
+        """Open a background tab in the same context (shares cookies) for prefetching."""
         try:
-            for a in self.page.locator("a[href*='/solutions/']").all():
-                try:
-                    href = a.get_attribute("href", timeout=500)
-                    if not href:
-                        continue
-                    full = href if href.startswith("http") else f"https://leetcode.com{href}"
-                    # Skip the solutions listing page itself
-                    if full.rstrip("/").endswith("/solutions"):
-                        continue
-                    if full not in seen:
-                        seen.add(full)
-                        links.append(full)
-                except Exception:
-                    continue
+            return self.page.context.new_page()
+        except Exception as e:
+            logger.debug(f"Could not open prefetch tab: {e}")
+            return None
+
+    @staticmethod
+    def _prefetch(page: Page, url: str) -> Optional[str]:
+        """Start loading `url` in `page`; returns as soon as the response commits."""
+        try:
+            page.goto(url, wait_until="commit")
+            return url
+        except Exception as e:
+            logger.debug(f"Prefetch failed for {url}: {e}")
+            return None
+
+    def _get_solution_links(self, limit: int = 24) -> List[Tuple[str, int]]:
+        """
+        Collect up to `limit` (url, votes) pairs for solution detail pages on the
+        current listing, in listing order. Filtering (this problem's
+        /solutions/<id> pages only), dedupe and reading each card's vote label
+        all happen in the browser, so Python receives a ready list.
+        """
+        m = _PROBLEM_URL_RE.match(self.page.url)
+        try:
+            # One round-trip: the browser resolves relative hrefs via `a.href`
+            rows = self.page.evaluate(
+                """({limit, slug, cardSel, voteSel}) => {
+                    const prefix = slug ? `/problems/${slug}/solutions/` : null;
+                    const seen = new Set();
+                    const out = [];
+                    for (const a of document.querySelectorAll("a[href*='/solutions/']")) {
+                        const path = a.pathname;
+                        // Skip the listing page itself and other problems' solutions
+                        const ok = prefix
+                            ? path.startsWith(prefix) && path.length > prefix.length
+                            : /\\/solutions\\/[^/]+/.test(path);
+                        if (!ok || seen.has(a.href)) continue;
+                        seen.add(a.href);
+                        // Nearest card container; otherwise climb a few levels
+                        let card = a.closest(cardSel);
+                        for (let k = 0, el = a; !card && k < 4 && el.parentElement; k++) {
+                            el = el.parentElement;
+                            if (el.querySelector(voteSel)) card = el;
+                        }
+                        const vote = card && card.querySelector(voteSel);
+                        out.push([a.href, vote ? (vote.innerText || '').trim() : '']);
+                        if (out.length >= limit) break;
+                    }
+                    return out;
+                }""",
+                {
+                    "limit": limit,
+                    "slug": m.group(2) if m else None,
+                    "cardSel": LEETCODE_SOLUTIONS["solution_card"],
+                    "voteSel": LEETCODE_SOLUTIONS["vote_count"],
+                },
+            )
+        except Exception as e:
+            logger.warning(f"Error collecting solution links in-page: {e} — parsing a DOM snapshot")
+            return self._solution_links_from_snapshot(limit, m.group(2) if m else None)
+        return [(href, self._extract_vote_count(vote_text)) for href, vote_text in rows]
+
+    def _solution_links_from_snapshot(self, limit: int, slug: Optional[str]) -> List[Tuple[str, int]]:
+        """
+        Fallback for _get_solution_links: one page.content() call, parsed in
+        Python. Vote labels are not recoverable from flat HTML, so votes are 0
+        and the caller keeps its listing-order heuristic.
+        """
+        try:
+            html = self.page.content()
         except Exception as e:
             logger.error(f"Error collecting solution links: {e}")
-        return links
+            return []
+        base = self.page.url
+        prefix = f"/problems/{slug}/solutions/" if slug else None
+        parser = _AnchorCollector()
+        parser.feed(html)
+        out: List[Tuple[str, int]] = []
+        seen = set()
+        for href in parser.hrefs:
+            url = urljoin(base, href).split("#")[0]
+            path = urlparse(url).path
+            ok = (
+                path.startswith(prefix) and len(path) > len(prefix)
+                if prefix else bool(_SOLUTION_PATH_RE.search(path))
+            )
+            if not ok or url in seen:
+                continue
+            seen.add(url)
+            out.append((url, 0))
+            if len(out) >= limit:
+                break
+        return out
 
-    def _open_solutions_tab(self) -> bool:
+    def _open_solutions_tab(self, language: Optional[str] = None) -> bool:
         """
         Navigate directly to the /solutions/ URL for the current problem.
         This is more reliable than looking for a Solutions tab in the UI,
         which LeetCode changes frequently.
+
+        With `language`, the languageTags filter is part of that same URL, so
+        the listing is opened pre-filtered instead of loaded twice.
         """
         current_url = self.page.url
 
@@ -115,47 +414,62 @@ class LeetCodeSolutionScraper:
             return False
 
         # Extract base problem URL: https://leetcode.com/problems/{slug}
-        m = re.match(r'(https://leetcode\.com/problems/[^/?#]+)', current_url)
+        m = _PROBLEM_URL_RE.match(current_url)
         if m:
             base = m.group(1).rstrip('/')
             solutions_url = f"{base}/solutions/"
+            if language:
+                solutions_url += f"?languageTags={language.lower()}"
             logger.info(f"Navigating directly to solutions page: {solutions_url}")
             for attempt in range(3):
                 try:
                     self.page.goto(solutions_url)
-                    self.page.wait_for_load_state("load")
-                    self.page.wait_for_timeout(1_500)
+                    self._loc_cache.clear()  # navigation voids previously resolved elements
+                    self._wait_for_listing()
                     logger.info("Opened LeetCode Solutions page ✅")
                     return True
                 except Exception as e:
                     if attempt < 2:
                         logger.warning(f"Solutions page navigation failed (attempt {attempt+1}/3): {e} — retrying…")
-                        time.sleep(2)
+                        time.sleep(backoff_delay(attempt + 1, self.settings.retry_delay))
                     else:
                         logger.error(f"Solutions page navigation failed after 3 attempts: {e}")
             return False
 
-        # Fallback: try clicking a Solutions tab in the UI
-        selectors = [
-            "a:has-text('Solutions')",
-            "div[role='tab']:has-text('Solutions')",
-            "button:has-text('Solutions')",
-            "li:has-text('Solutions')",
-        ]
-        for sel in selectors:
-            try:
-                tab = self.page.locator(sel).first
-                tab.wait_for(state="visible", timeout=TIMEOUT_SHORT)
-                tab.click()
-                self.page.wait_for_load_state("load")
-                self.page.wait_for_timeout(1_500)
-                logger.info("Opened LeetCode Solutions tab ✅")
-                return True
-            except PWTimeout:
-                continue
+        # Fallback: try clicking a Solutions tab in the UI — plain CSS candidates
+        # raced in a single wait, labelled ones filtered on their exact text
+        tab = self.page.locator("a[href*='/solutions']").or_(
+            self.page.locator("[role='tab'], button, li").filter(has_text=_SOLUTIONS_LABEL_RE)
+        ).first
+        try:
+            tab.wait_for(state="visible", timeout=TIMEOUT_SHORT)
+            tab.click()
+            self._loc_cache.clear()
+            self._wait_for_listing()
+            logger.info("Opened LeetCode Solutions tab ✅")
+            return True
+        except PWTimeout:
+            pass
         logger.error("Could not navigate to Solutions page")
         return False
 
+    def _wait_for_listing(self):
+        """
+        Wait until the solutions listing has rendered a solution-post link (or
+        its empty state). The tab bar's own Solutions link also contains
+        '/solutions/', so only post paths with a numeric id segment count.
+        """
+        try:
+            self.page.wait_for_function(
+                """() => Array.from(document.querySelectorAll("a[href*='/problems/'][href*='/solutions/']"))
+                        .some(a => /\\/problems\\/[^/]+\\/solutions\\/\\d+/.test(a.pathname))
+                    || (document.body && document.body.textContent.includes('No solutions yet'))""",
+                polling=250,
+                timeout=TIMEOUT_MEDIUM,
+            )
+        except PWTimeout:
+            logger.debug("Solutions listing slow to render — continuing")
+
     def _apply_language_filter(self, language: str):
         """
         Apply language filter via URL parameter — much more reliable than UI clicks.
@@ -174,8 +488,7 @@ class LeetCodeSolutionScraper:
 
         logger.debug(f"Applying language filter via URL: {new_url}")
         self.page.goto(new_url)
-        self.page.wait_for_load_state("load")
-        self.page.wait_for_timeout(1_000)
+        self._wait_for_listing()
         logger.debug(f"Language filter set to {language} ✅")
 
     def _extract_code_from_solution_page(self) -> Optional[str]:
@@ -183,68 +496,66 @@ class LeetCodeSolutionScraper:
         On a solution detail page, find and extract the Java code.
         Tries multiple strategies in order of reliability.
         """
-        # Strategy 1: Read-only Monaco editor (LeetCode embeds this in solution pages)
-        try:
-            code = self.page.evaluate(
-                """() => {
-                    if (typeof monaco !== 'undefined') {
-                        const models = monaco.editor.getModels();
-                        if (models && models.length > 0) {
-                            // Pick the largest model — solution pages may have the
-                            // problem stub in model[0] and the actual solution elsewhere.
-                            const vals = models.map(m => m.getValue()).filter(v => v);
-                            if (vals.length > 0) {
-                                return vals.reduce((a, b) => a.length > b.length ? a : b);
-                            }
-                        }
-                    }
-                    return null;
-                }"""
-            )
-            # Require >150 chars to reject default empty stubs (~80-100 chars)
-            if code and len(code) > 150:
-                logger.info(f"Extracted code via Monaco JS ({len(code)} chars) ✅")
-                return code
-        except Exception:
-            pass
-
-        # Strategy 2: DOM selectors
-        code_selectors = [
-            "pre code",
-            ".view-lines",
-            "[class*='CodeMirror'] .CodeMirror-code",
-            "[class*='hljs']",
-            "code[class*='language-java']",
-            "code[class*='language-']",
-            "code",
-            "pre",
-        ]
-        for sel in code_selectors:
-            try:
-                el = self.page.locator(sel).first
-                el.wait_for(state="visible", timeout=TIMEOUT_MEDIUM)
-                code = el.inner_text().strip()
-                if code and len(code) > 20:
-                    logger.info(f"Extracted solution code via DOM ({len(code)} chars) ✅")
-                    return code
-            except PWTimeout:
-                continue
+        # Strategies 1+2: Monaco models and DOM selectors, probed in one round-trip;
+        # if nothing has rendered yet, the same probe is polled in-page
+        found = self._probe_code() or self._probe_code(timeout=TIMEOUT_MEDIUM)
+        if found:
+            source, code = found
+            logger.info(f"Extracted solution code via {source} ({len(code)} chars) ✅")
+            return code
 
         # Strategy 3: Copy button / clipboard
         logger.warning("Could not extract code via DOM — trying clipboard copy")
         return self._extract_via_copy_button()
 
+    def _probe_code(self, timeout: int = 0) -> Optional[Tuple[str, str]]:
+        """
+        Return ("Monaco JS" | "DOM", code) for the first usable code source, or None.
+        Monaco wins when its largest model has >150 chars (rejects empty stubs of
+        ~80-100 chars); otherwise the first selector text longer than 20 chars.
+
+        With a `timeout`, the same probe is polled in the page until it finds
+        something — one overall wait instead of one per selector.
+        """
+        try:
+            if timeout:
+                handle = self.page.wait_for_function(
+                    _PROBE_CODE_JS, arg=_CODE_SELECTORS, polling=100, timeout=timeout
+                )
+                found = handle.json_value()
+                handle.dispose()
+            else:
+                found = self.page.evaluate(_PROBE_CODE_JS, _CODE_SELECTORS)
+        except PWTimeout:
+            return None
+        except Exception as e:
+            logger.debug(f"Code probe failed: {e}")
+            return None
+        return tuple(found) if found else None
+
     def _extract_via_copy_button(self) -> Optional[str]:
-        """Try clicking a 'Copy' button if present and read clipboard."""
+        """
+        Click Copy and read the clipboard. Only reached after _probe_code found
+        no usable code block in the DOM, so there is nothing to re-read first.
+        """
         try:
-            copy_btn = self.page.locator(
-                "button:has-text('Copy'), [aria-label*='copy'], [title*='copy']"
+            copy_btn = self.page.locator("[aria-label*='copy'], [title*='copy']").or_(
+                self.page.locator("button").filter(has_text=_COPY_LABEL_RE)
             ).first
             copy_btn.wait_for(state="visible", timeout=TIMEOUT_SHORT)
             copy_btn.click()
-            time.sleep(0.5)
-            # Read clipboard via JS
-            code = self.page.evaluate("() => navigator.clipboard.readText()")
+            # Resolves as soon as the clipboard holds the code (no fixed sleep)
+            code = self.page.wait_for_function(
+                """async () => {
+                    try {
+                        const t = await navigator.clipboard.readText();
+                        return t && t.length > 20 ? t : null;
+                    } catch (e) {
+                        return null;
+                    }
+                }""",
+                timeout=TIMEOUT_SHORT,
+            ).json_value()
             if code:
                 logger.info(f"Extracted code via clipboard ({len(code)} chars)")
                 return code
@@ -255,7 +566,7 @@ class LeetCodeSolutionScraper:
     def _fallback_first_code_block(self) -> Optional[str]:
         """Emergency fallback: grab the first code block on the solutions page."""
         try:
-            el = self.page.locator("pre code, pre, code").first
+            el = self._loc("pre code, pre, code")
             el.wait_for(state="visible", timeout=TIMEOUT_SHORT)
             code = el.inner_text().strip()
             if code:
@@ -267,20 +578,38 @@ class LeetCodeSolutionScraper:
 
     @staticmethod
     def _extract_vote_count(text: str) -> int:
-        """Parse a vote/like count number from card text (kept for compatibility)."""
-        patterns = [r"(\d+\.?\d*)[Kk]", r"(\d+)"]
-        for pat in patterns:
-            m = re.search(pat, text)
-            if m:
-                val = m.group(1)
-                try:
-                    num = float(val)
-                    if "k" in text[m.start():m.end()+1].lower():
-                        num *= 1000
-                    return int(num)
-                except ValueError:
-                    pass
-        return 0
+        """Parse a vote/like count number from a card's vote label ('1.2K', '87')."""
+        # Labels are a few chars long — a linear scan beats two regex searches
+        n = len(text)
+        i = 0
+        while i < n and not text[i].isdigit():
+            i += 1
+        j = i
+        while j < n and (text[j].isdigit() or text[j] == "."):
+            j += 1
+        if i == j:
+            return 0
+        try:
+            val = float(text[i:j])
+        except ValueError:  # e.g. "1.2.3"
+            return 0
+        if j < n:
+            val *= _VOTE_SCALE.get(text[j].lower(), 1)
+        return int(val)
+
+
+class _AnchorCollector(HTMLParser):
+    """Collects the href of every <a> that links into a /solutions/ page."""
+
+    def __init__(self):
+        super().__init__()
+        self.hrefs: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "a":
+            href = dict(attrs).get("href")
+            if href and "/solutions/" in href:
+                self.hrefs.append(href)
 
 
 # ── module-level helpers ────────────────────────────────────────────────────────
@@ -292,5 +621,10 @@ def _is_valid_java(code: str) -> bool:
     """
     if not code or len(code) < 150:  # stubs are usually < 100 chars
         return False
-    java_keywords = ["class ", "public ", "return ", "{", "}"]
-    return sum(1 for kw in java_keywords if kw in code) >= 4
+    # Single pass over the code; stop as soon as 4 distinct markers are seen
+    seen = set()
+    for m in _JAVA_KWS.finditer(code):
+        seen.add(m.group(0))
+        if len(seen) >= 4:
+            return True
+    return False
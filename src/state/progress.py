@@ -1,8 +1,10 @@
 """Progress tracking — nested per course / day / problem."""
 
+import atexit
 import json
 import os
-from typing import Dict, Any, List
+import threading
+from typing import Dict, Any, List, Optional, Set, Tuple
 
 from src.utils.logger import setup_logger
 
@@ -26,11 +28,24 @@ class ProgressTracker:
         "task_problems": {}
       }
     }
+
+    Problem IDs are lists on disk but sets in memory, for O(1) membership checks.
     """
 
+    _SAVE_DEBOUNCE = 1.0  # seconds — back-to-back mutations coalesce into one write
+    _COURSES = ("class_problems", "task_problems")
+
     def __init__(self, filepath: str):
         self.filepath = filepath
         self.data: Dict[str, Any] = self._load()
+        # Running totals behind `stats`: counted once here, then kept in step by the mutations
+        self._completed_count, self._failed_count = self._count()
+        self._dirty = False
+        # Re-entrant: mutations hold it while calling save(); the timer thread's
+        # flush() must never serialize a half-mutated dict
+        self._save_lock = threading.RLock()
+        self._save_timer: Optional[threading.Timer] = None
+        atexit.register(self.flush)
 
     # ── persistence ────────────────────────────────────────────────────────────
 
@@ -38,57 +53,84 @@ class ProgressTracker:
         if os.path.exists(self.filepath):
             try:
                 with open(self.filepath, "r") as f:
-                    return json.load(f)
+                    return _lists_to_sets(json.load(f))
             except (json.JSONDecodeError, IOError):
                 logger.warning(f"Could not read {self.filepath} — starting fresh")
         return {"class_problems": {}, "task_problems": {}, "failed": {"class_problems": {}, "task_problems": {}}}
 
     def save(self):
-        with open(self.filepath, "w") as f:
-            json.dump(self.data, f, indent=2)
+        """Mark state dirty; it is written by flush() after a short debounce."""
+        with self._save_lock:
+            self._dirty = True
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(self._SAVE_DEBOUNCE, self.flush)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+
+    def flush(self):
+        """Persist pending changes now: compact JSON to a temp file, then atomic rename."""
+        with self._save_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if not self._dirty:
+                return
+            tmp = self.filepath + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                # default=sorted writes each in-memory set as a sorted list
+                json.dump(self.data, f, ensure_ascii=False, separators=(",", ":"), default=sorted)
+            os.replace(tmp, self.filepath)  # readers never see a partial file
+            self._dirty = False
+        logger.debug(f"Progress saved to {self.filepath}")
 
     # ── completion checks ───────────────────────────────────────────────────────
 
     def is_completed(self, course: str, day: str, problem_id: str) -> bool:
         """Return True if this problem was already solved and marked complete."""
-        return problem_id in self.data.get(course, {}).get(day, [])
+        return problem_id in self.data.get(course, {}).get(day, ())
 
     def get_completed_problems(self, course: str, day: str) -> List[str]:
-        return self.data.get(course, {}).get(day, [])
+        return sorted(self.data.get(course, {}).get(day, ()))
 
     def is_day_complete(self, course: str, day: str, total_problems: int) -> bool:
-        return len(self.get_completed_problems(course, day)) >= total_problems
+        return len(self.data.get(course, {}).get(day, ())) >= total_problems
 
     # ── state mutations ─────────────────────────────────────────────────────────
 
     def mark_completed(self, course: str, day: str, problem_id: str):
-        if course not in self.data:
-            self.data[course] = {}
-        if day not in self.data[course]:
-            self.data[course][day] = []
-        if problem_id not in self.data[course][day]:
-            self.data[course][day].append(problem_id)
-        # Remove from failed if it was there
-        failed = self.data.get("failed", {}).get(course, {}).get(day, [])
-        if problem_id in failed:
-            failed.remove(problem_id)
-        self.save()
-        logger.info(f"Progress saved: {course} / {day} / {problem_id}")
+        with self._save_lock:
+            done = self.data.setdefault(course, {}).setdefault(day, set())
+            if problem_id not in done:
+                done.add(problem_id)
+                if course in self._COURSES:
+                    self._completed_count += 1
+            # Remove from failed if it was there
+            failed = self.data.get("failed", {}).get(course, {}).get(day, set())
+            if problem_id in failed:
+                failed.discard(problem_id)
+                self._failed_count -= 1
+            self.save()
+        logger.info(f"Progress updated: {course} / {day} / {problem_id}")
 
     def mark_failed(self, course: str, day: str, problem_id: str):
-        failed = self.data.setdefault("failed", {})
-        failed.setdefault(course, {}).setdefault(day, [])
-        if problem_id not in failed[course][day]:
-            failed[course][day].append(problem_id)
-        self.save()
+        with self._save_lock:
+            failed = self.data.setdefault("failed", {}).setdefault(course, {}).setdefault(day, set())
+            if problem_id not in failed:
+                failed.add(problem_id)
+                self._failed_count += 1
+            self.save()
 
     # ── stats ───────────────────────────────────────────────────────────────────
 
     @property
     def stats(self) -> Dict[str, int]:
+        return {"completed": self._completed_count, "failed": self._failed_count}
+
+    def _count(self) -> Tuple[int, int]:
+        """Full traversal for (completed, failed) — run once at load time."""
         total = sum(
             len(problems)
-            for course in ("class_problems", "task_problems")
+            for course in self._COURSES
             for problems in self.data.get(course, {}).values()
         )
         failed = sum(
@@ -96,4 +138,20 @@ class ProgressTracker:
             for course_dict in self.data.get("failed", {}).values()
             for problems in course_dict.values()
         )
-        return {"completed": total, "failed": failed}
+        return total, failed
+
+
+def _lists_to_sets(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert every leaf problem list (course → day → [ids], incl. under "failed") to a set."""
+    def convert(days: Dict[str, Any]) -> Dict[str, Set[str]]:
+        return {day: set(ids) for day, ids in days.items()}
+
+    out: Dict[str, Any] = {}
+    for key, value in data.items():
+        if key == "failed" and isinstance(value, dict):
+            out[key] = {course: convert(days) for course, days in value.items()}
+        elif isinstance(value, dict):
+            out[key] = convert(value)
+        else:
+            out[key] = value
+    return out
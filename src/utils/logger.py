@@ -1,21 +1,69 @@
 """Logging setup for the BytsOne bot."""
 
+import atexit
 import logging
+import logging.handlers
 import os
-import colorlog
+import queue
+from typing import Optional
 
+# Set once the log directory exists and the level has been resolved, so
+# later setup_logger() calls skip the settings import and makedirs.
+_ROOT_CONFIGURED: bool = False
+_LEVEL: int = logging.INFO
+_LOG_FILE: str = ""
 
-def setup_logger(name: str) -> logging.Logger:
-    """Create a named logger with color console output and file output."""
+# File output goes through one bounded queue drained by a single listener
+# thread, so logger calls never wait on disk I/O.
+_LOG_QUEUE_SIZE = 10_000
+_queue_handler: Optional[logging.Handler] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def _configure_root() -> None:
+    """Resolve the log level, create the log directory and start the file listener (once)."""
+    global _ROOT_CONFIGURED, _LEVEL, _LOG_FILE, _queue_handler, _listener
     from src.config.settings import settings
 
-    os.makedirs(os.path.dirname(settings.log_file), exist_ok=True)
+    _LOG_FILE = settings.log_file
+    _LEVEL = getattr(logging, settings.log_level.upper(), logging.INFO)
+    log_dir = os.path.dirname(_LOG_FILE)
+    if log_dir:
+        try:
+            os.makedirs(log_dir)
+        except FileExistsError:
+            pass
+
+    file_handler = logging.FileHandler(_LOG_FILE, encoding="utf-8")
+    file_handler.setFormatter(logging.Formatter(
+        "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+    ))
+    file_handler.setLevel(_LEVEL)
+
+    log_queue: queue.Queue = queue.Queue(maxsize=_LOG_QUEUE_SIZE)
+    _queue_handler = logging.handlers.QueueHandler(log_queue)
+    _queue_handler.setLevel(_LEVEL)
+    _listener = logging.handlers.QueueListener(
+        log_queue, file_handler, respect_handler_level=True
+    )
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    _ROOT_CONFIGURED = True
 
+
+def setup_logger(name: str) -> logging.Logger:
+    """Create a named logger with color console output and file output."""
     logger = logging.getLogger(name)
     if logger.handlers:
         return logger  # already configured
 
-    level = getattr(logging, settings.log_level.upper(), logging.INFO)
+    if not _ROOT_CONFIGURED:
+        _configure_root()
+
+    import colorlog  # deferred: only needed once a logger is actually configured
+
+    level = _LEVEL
     logger.setLevel(level)
 
     # Colored console handler
@@ -26,13 +74,6 @@ def setup_logger(name: str) -> logging.Logger:
     ))
     console.setLevel(level)
 
-    # File handler
-    file_handler = logging.FileHandler(settings.log_file, encoding="utf-8")
-    file_handler.setFormatter(logging.Formatter(
-        "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
-    ))
-    file_handler.setLevel(level)
-
     logger.addHandler(console)
-    logger.addHandler(file_handler)
+    logger.addHandler(_queue_handler)  # file output via the shared listener
     return logger
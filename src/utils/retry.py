@@ -0,0 +1,12 @@
+"""Retry timing helpers."""
+
+import random
+
+
+def backoff_delay(attempt: int, base: float, cap: float = 30.0) -> float:
+    """
+    Exponential backoff with jitter for the 1-based `attempt`:
+    base · 2^(attempt-1) · U(1, 1.5), capped at `cap` seconds.
+    The jitter keeps concurrent retries from hitting a rate limit in lockstep.
+    """
+    return min(cap, base * (2 ** (attempt - 1)) * (1 + random.random() * 0.5))
@@ -0,0 +1,14 @@
+"""Text helpers shared by the scraper and AI solver."""
+
+import re
+from functools import lru_cache
+
+# Opening (```java) or closing fence, matched in a single pass
+_FENCE_RE = re.compile(r"(?:^```[\w]*\n?)|(?:\n?```$)", re.MULTILINE)
+
+
+# Retries and cache hits hand back the same response text; keep a few recent ones
+@lru_cache(maxsize=16)
+def strip_markdown(code: str) -> str:
+    """Remove markdown code fences around (or inside) a code snippet."""
+    return _FENCE_RE.sub("", code).strip()